@@ -1,15 +1,45 @@
 # buffer.py — Buffer → Pinterest (local image upload + schedule)
-# pip install requests pillow
+# pip install requests pillow  (optional: aiohttp for concurrent uploads, orjson, brotli)
 
+import argparse
+import asyncio
+import csv
+import functools
+import hashlib
 import json
-import mimetypes
 import os
-import pathlib
 import re
 import requests
-from typing import Dict, List, Optional
+import struct
+import time
+from http.cookies import SimpleCookie
+from types import MappingProxyType
+from typing import Dict, List, Optional, Tuple
 from urllib.parse import urlparse
 from PIL import Image
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+try:
+    import aiohttp
+    from yarl import URL
+except ImportError:  # concurrent uploads fall back to the sequential path
+    aiohttp = None
+
+try:
+    import brotli  # noqa: F401 — lets urllib3/aiohttp decode "br" responses
+    _ACCEPT_ENCODING = "gzip, deflate, br"
+except ImportError:
+    _ACCEPT_ENCODING = "gzip, deflate"
+
+try:
+    import orjson
+    _dumps = orjson.dumps
+    _loads = orjson.loads
+except ImportError:  # stdlib fallback with the same bytes-in/bytes-out shape
+    def _dumps(obj) -> bytes:
+        return json.dumps(obj, separators=(",", ":")).encode("utf-8")
+    _loads = json.loads
 
 # ====== CONFIG ==============================================================
 COOKIES_TXT_PATH = r"C:\Users\benar\OneDrive\Bureau\canva\cookies.txt"
@@ -20,6 +50,9 @@ UPLOAD_TYPE = "postAsset"         # from your DevTools/cURL
 IMAGES_DIRECTORY = "images"       # folder next to this script
 SLOTS_START = "2025-08-01"        # optional
 SLOTS_END   = "2025-08-31"        # optional
+UPLOAD_CONCURRENCY = 8            # parallel S3 PUTs in batch uploads
+SLOTS_CACHE_DIR = os.path.join(os.path.expanduser("~"), ".cache", "buffer_slots")
+SLOTS_CACHE_TTL = 5 * 60          # seconds
 # ===========================================================================
 
 BASE = "https://publish.buffer.com"
@@ -31,81 +64,171 @@ COOKIE_WHITELIST: List[str] = [
     "AWSALBTG", "AWSALBTGCORS", "__stripe_mid", "__stripe_sid",
 ]
 SUPPORTED_FORMATS = {".jpg", ".jpeg", ".png", ".webp", ".gif", ".bmp"}
+_EXT_TO_MIME = {
+    ".jpg": "image/jpeg", ".jpeg": "image/jpeg", ".png": "image/png",
+    ".webp": "image/webp", ".gif": "image/gif", ".bmp": "image/bmp",
+}
+
+# ---------- session ----------
+# One pooled session for Buffer + S3 so presign → PUT → finalize reuse the
+# same keep-alive connections instead of a fresh TLS handshake per call.
+class _BufferRetry(Retry):
+    """Retry policy that never replays a POST the server may have acted on.
+
+    Composer POSTs include /1/updates/create.json, which is not idempotent: a
+    502/504 or a read error can arrive after the pin was created. POSTs are
+    therefore left out of allowed_methods (no read-error retries) and only
+    retried on 429/503, where the request was turned away. Connect errors are
+    retried for every method since nothing was sent.
+    """
+
+    def is_retry(self, method: str, status_code: int, has_retry_after: bool = False) -> bool:
+        if method.upper() == "POST":
+            return status_code in (429, 503)
+        return super().is_retry(method, status_code, has_retry_after)
+
+SESSION = requests.Session()
+_ADAPTER = HTTPAdapter(
+    pool_connections=4,
+    pool_maxsize=16,
+    # Buffer throws transient 502/503s; retry them (and 429s, honouring
+    # Retry-After) rather than failing the whole presign → PUT → finalize run.
+    # File bodies (S3 PUT) are rewound by urllib3 before each retry.
+    max_retries=_BufferRetry(total=3, backoff_factor=0.5,
+                             status_forcelist=[429, 502, 503, 504],
+                             allowed_methods=frozenset({"GET", "PUT"}),
+                             respect_retry_after_header=True,
+                             raise_on_status=False),  # let callers report the body
+)
+SESSION.mount("http://", _ADAPTER)
+SESSION.mount("https://", _ADAPTER)
+_SESSION_HEADERS = {
+    "User-Agent": "Mozilla/5.0",
+    "Accept-Language": "en-US,en;q=0.9",
+    "Origin": BASE,
+    "x-buffer-client-id": "webapp-publishing",
+    "Accept-Encoding": _ACCEPT_ENCODING,  # JSON replies compress 3–5×
+}
+SESSION.headers.update(_SESSION_HEADERS)
 
 # ---------- cookies ----------
-def parse_cookies_txt(path: str) -> Dict[str, str]:
-    text = pathlib.Path(path).read_text(encoding="utf-8", errors="ignore")
+_COOKIE_KV_RE = re.compile(rb"([^=;]+)=([^;]+)")
+_COOKIE_WHITELIST_BYTES = frozenset(name.encode() for name in COOKIE_WHITELIST)
+
+@functools.lru_cache(maxsize=4)
+def parse_cookies_txt(path: str, mtime: float) -> Dict[str, str]:
+    """Parse the whitelisted cookies from a Netscape cookies.txt or a "name=value; …" export.
+
+    Works on the raw bytes and only decodes names/values that survive the
+    whitelist. Cached per (path, mtime) so a long-running process only
+    re-reads the file after it changes; callers pass os.path.getmtime(path)
+    and must not mutate the returned dict.
+    """
+    with open(path, "rb") as fh:
+        raw = fh.read()
     jar: Dict[str, str] = {}
-    if "\t" in text or "\n" in text:  # Netscape TSV
-        for line in text.splitlines():
-            line = line.strip()
-            if not line or line.startswith("#") or "\t" not in line:
-                continue
-            parts = line.split("\t")
+    for line in raw.split(b"\n"):
+        line = line.strip()
+        if not line or line.startswith(b"#"):
+            continue
+        if b"\t" in line:  # Netscape TSV
+            parts = line.split(b"\t")
             if len(parts) >= 7:
                 name = parts[5].strip()
-                value = parts[6].strip()
-                if name:
-                    jar[name] = value
-    else:  # "name=value; name2=value2"
-        for m in re.finditer(r"([^=;]+)=([^;]+)", text):
-            jar[m.group(1).strip()] = m.group(2).strip()
+                if name in _COOKIE_WHITELIST_BYTES:
+                    jar[name.decode()] = parts[6].strip().decode("utf-8", "ignore")
+        elif b"=" in line:  # "name=value; name2=value2"
+            for m in _COOKIE_KV_RE.finditer(line):
+                name = m.group(1).strip()
+                if name in _COOKIE_WHITELIST_BYTES:
+                    jar[name.decode()] = m.group(2).strip().decode("utf-8", "ignore")
     return jar
 
-def build_cookie_header(allcookies: Dict[str, str], whitelist: List[str]) -> str:
-    pairs = [f"{k}={allcookies[k]}" for k in whitelist if k in allcookies]
-    header = "; ".join(pairs)
-    print("Using cookies:", ", ".join([k for k in whitelist if k in allcookies]))
-    print("Cookie header length:", len(header))
-    if not header:
+@functools.lru_cache(maxsize=4)
+def _whitelisted_cookies(items: frozenset, whitelist: tuple) -> tuple:
+    found = dict(items)
+    return tuple((k, found[k]) for k in whitelist if k in found)
+
+def apply_session_cookies(allcookies: Dict[str, str], whitelist: List[str]) -> None:
+    """Load whitelisted cookies into SESSION, scoped to *.buffer.com (never sent to S3)."""
+    pairs = _whitelisted_cookies(frozenset(allcookies.items()), tuple(whitelist))
+    print("Using cookies:", ", ".join(k for k, _ in pairs))
+    if not pairs:
         raise RuntimeError("No cookies from whitelist found in cookies.txt")
-    return header
+    for k, v in pairs:
+        SESSION.cookies.set(k, v, domain=".buffer.com")
 
 # ---------- proxy ----------
-def composer_proxy(cookie_header: str, inner_obj: dict) -> dict:
-    headers = {
-        "Accept": "application/json",
-        "Content-Type": "application/json",
-        "Origin": BASE,
-        "Referer": f"{BASE}/all-channels?tab=queue",
-        "User-Agent": "Mozilla/5.0",
-        "Accept-Language": "en-US,en;q=0.9",
-        "Cookie": cookie_header,
-    }
-    payload = {"args": json.dumps(inner_obj)}  # exact browser shape
-    r = requests.post(RPC, headers=headers, data=json.dumps(payload))
+# Per-call headers on top of SESSION's; shared read-only, never rebuilt per request
+_RPC_HEADERS = MappingProxyType({
+    "Accept": "application/json",
+    "Content-Type": "application/json",
+    "Referer": f"{BASE}/all-channels?tab=queue",
+})
+
+def _composer_body(inner_obj: dict) -> bytes:
+    """{"args": "<inner JSON as a string>"} — the exact browser shape.
+
+    The inner JSON text never contains raw control characters, so quoting it
+    as a JSON string only needs backslashes and double quotes escaped; this
+    skips a second serialization pass over the (large) inner payload.
+    """
+    inner = _dumps(inner_obj)
+    return b'{"args":"' + inner.replace(b"\\", b"\\\\").replace(b'"', b'\\"') + b'"}'
+
+def composer_proxy(inner_obj: dict) -> dict:
+    r = SESSION.post(RPC, headers=_RPC_HEADERS, data=_composer_body(inner_obj))
     if r.status_code >= 400:
         raise requests.HTTPError(f"{r.status_code} {r.reason} – {r.text[:400]}")
-    return r.json().get("result", r.json())
+    data = _loads(r.content)
+    return data.get("result", data)
 
-def get_slots(cookie_header: str, profile_id: str, start_day: str, end_day: str):
+def get_slots(profile_id: str, start_day: str, end_day: str):
     inner = {
         "url": f"/1/profiles/{profile_id}/schedules/slots.json",
         "args": {"start_day": start_day, "end_day": end_day},
         "HTTPMethod": "GET",
     }
-    return composer_proxy(cookie_header, inner)
+    return composer_proxy(inner)
+
+def get_slots_cached(profile_id: str, start_day: str, end_day: str, use_cache: bool = True):
+    """get_slots with an on-disk cache (SLOTS_CACHE_TTL seconds) keyed by the query."""
+    key = hashlib.sha1(f"{profile_id}|{start_day}|{end_day}".encode()).hexdigest()
+    path = os.path.join(SLOTS_CACHE_DIR, f"{key}.json")
+    if use_cache:
+        try:
+            if time.time() - os.path.getmtime(path) < SLOTS_CACHE_TTL:
+                with open(path, "rb") as f:
+                    return _loads(f.read())
+        except (OSError, ValueError):
+            pass  # missing/corrupt cache → refetch
+    slots = get_slots(profile_id, start_day, end_day)
+    try:  # best-effort; write to a temp file and swap so readers never see half a file
+        os.makedirs(SLOTS_CACHE_DIR, exist_ok=True)
+        tmp = f"{path}.{os.getpid()}.tmp"
+        with open(tmp, "wb") as f:
+            f.write(_dumps(slots))
+        os.replace(tmp, path)
+    except OSError:
+        pass
+    return slots
 
 # ---------- GraphQL pre-sign ----------
-def graphql_presign(cookie_header: str, file_name: str, mime_type: str) -> dict:
-    headers = {
-        "Accept": "application/json",
-        "Content-Type": "application/json",
-        "Origin": BASE,
-        "Referer": "https://publish.buffer.com/",
-        "User-Agent": "Mozilla/5.0",
-        "Accept-Language": "en-US,en;q=0.9",
-        "Cookie": cookie_header,
-        "x-buffer-client-id": "webapp-publishing",
-    }
-    gql_query = (
-        "query s3PreSignedURL($input: S3PreSignedURLInput!) {"
-        "  s3PreSignedURL(input: $input) { url key bucket __typename }"
-        "}"
-    )
-    payload = {
+_GQL_HEADERS = MappingProxyType({
+    "Accept": "application/json",
+    "Content-Type": "application/json",
+    "Referer": "https://publish.buffer.com/",
+})
+_GQL_PRESIGN_QUERY = (
+    "query s3PreSignedURL($input: S3PreSignedURLInput!) {"
+    "  s3PreSignedURL(input: $input) { url key bucket __typename }"
+    "}"
+)
+
+def _presign_payload(file_name: str, mime_type: str) -> dict:
+    return {
         "operationName": "s3PreSignedURL",
-        "query": gql_query,
+        "query": _GQL_PRESIGN_QUERY,
         "variables": {
             "input": {
                 "organizationId": ORG_ID,
@@ -115,10 +238,8 @@ def graphql_presign(cookie_header: str, file_name: str, mime_type: str) -> dict:
             }
         },
     }
-    r = requests.post(GRAPH, headers=headers, json=payload)
-    if r.status_code >= 400:
-        raise requests.HTTPError(f"{r.status_code} {r.reason} – {r.text[:400]}")
-    data = r.json()
+
+def _presign_result(data: dict) -> dict:
     if "errors" in data:
         raise RuntimeError(json.dumps(data["errors"][0], ensure_ascii=False))
     out = data.get("data", {}).get("s3PreSignedURL")
@@ -126,60 +247,224 @@ def graphql_presign(cookie_header: str, file_name: str, mime_type: str) -> dict:
         raise RuntimeError(f"Unexpected GraphQL result: {data}")
     return out
 
+def _presign_batch_body(files: List[Tuple[str, str]]):
+    # a lone file keeps the plain single-operation shape the web app sends
+    if len(files) == 1:
+        return _presign_payload(*files[0])
+    return [_presign_payload(name, mime) for name, mime in files]
+
+def _presign_batch_results(files: List[Tuple[str, str]], data) -> List[dict]:
+    results = data if isinstance(data, list) else [data]
+    if len(results) != len(files):
+        raise RuntimeError(f"Batched presign returned {len(results)} results for {len(files)} files")
+    return [_presign_result(d) for d in results]
+
+def graphql_presign_batch(files: List[Tuple[str, str]]) -> List[dict]:
+    """Pre-sign several (file_name, mime_type) pairs in one GraphQL round-trip."""
+    r = SESSION.post(GRAPH, headers=_GQL_HEADERS, data=_dumps(_presign_batch_body(files)))
+    if r.status_code >= 400:
+        raise requests.HTTPError(f"{r.status_code} {r.reason} – {r.text[:400]}")
+    return _presign_batch_results(files, _loads(r.content))
+
+def graphql_presign(file_name: str, mime_type: str) -> dict:
+    return graphql_presign_batch([(file_name, mime_type)])[0]
+
 # ---------- S3 PUT ----------
+S3_READ_BUFFER = 8 * 1024 * 1024  # large reads → fewer syscalls per upload
+
+def _s3_headers(filepath: str, mime_type: str) -> Dict[str, str]:
+    # explicit length: S3 rejects/buffers chunked bodies on pre-signed PUTs;
+    # S3 replies are empty/tiny XML, so don't ask it to compress them
+    return {"Content-Type": mime_type, "Content-Length": str(os.path.getsize(filepath)),
+            "Accept-Encoding": "identity"}
+
 def s3_put(upload_url: str, filepath: str, mime_type: str):
-    with open(filepath, "rb") as f:
-        r = requests.put(upload_url, data=f, headers={"Content-Type": mime_type})
+    headers = _s3_headers(filepath, mime_type)
+    with open(filepath, "rb", buffering=S3_READ_BUFFER) as f:
+        r = SESSION.put(upload_url, data=f, headers=headers)
     if r.status_code // 100 != 2:
         raise requests.HTTPError(f"S3 PUT failed: {r.status_code} {r.text[:300]}")
 
 # ---------- finalize ----------
-def finalize_upload(cookie_header: str, key: str) -> str:
-    inner = {
+def _finalize_inner(key: str) -> dict:
+    return {
         "url": "/i/uploads/upload_media.json",
         "args": {"key": key, "serviceForceTranscodeVideo": False},
         "HTTPMethod": "POST",
     }
-    res = composer_proxy(cookie_header, inner)
+
+def _finalize_location(res: dict) -> str:
     location = res.get("location") or res.get("details", {}).get("location")
     if not location:
         raise RuntimeError(f"Finalize missing 'location': {res}")
     return location
 
-def upload_image_to_buffer(cookie_header: str, image_path: str) -> str:
+def finalize_upload(key: str) -> str:
+    return _finalize_location(composer_proxy(_finalize_inner(key)))
+
+def _mime_type(image_path: str) -> str:
+    return _EXT_TO_MIME.get(os.path.splitext(image_path)[1].lower(), "image/webp")
+
+def upload_image_to_buffer(image_path: str) -> str:
     filename = os.path.basename(image_path)
-    mime_type = mimetypes.guess_type(image_path)[0] or "image/webp"
+    mime_type = _mime_type(image_path)
     print("Getting pre-signed URL from Buffer…")
-    presign = graphql_presign(cookie_header, filename, mime_type)
+    presign = graphql_presign(filename, mime_type)
     print("Uploading bytes to S3…")
     s3_put(presign["url"], image_path, mime_type)
     print("Finalizing upload with Buffer…")
-    media_url = finalize_upload(cookie_header, presign["key"])
+    media_url = finalize_upload(presign["key"])
     print(f"✓ Upload successful → {media_url}")
     return media_url
 
+# ---------- concurrent upload (aiohttp) ----------
+def _aiohttp_cookie_jar() -> "aiohttp.CookieJar":
+    """Mirror SESSION's Buffer cookies (same domain scoping) into an aiohttp jar."""
+    jar = aiohttp.CookieJar()
+    morsels = SimpleCookie()
+    for c in SESSION.cookies:
+        morsels[c.name] = c.value
+        morsels[c.name]["domain"] = c.domain
+    jar.update_cookies(morsels, URL(BASE))
+    return jar
+
+async def _composer_proxy_async(session: "aiohttp.ClientSession", inner_obj: dict) -> dict:
+    async with session.post(RPC, headers=_RPC_HEADERS, data=_composer_body(inner_obj)) as r:
+        body = await r.read()
+        if r.status >= 400:
+            raise requests.HTTPError(f"{r.status} {r.reason} – {body[:400].decode(errors='replace')}")
+    data = _loads(body)
+    return data.get("result", data)
+
+async def _presign_batch_async(session: "aiohttp.ClientSession",
+                               files: List[Tuple[str, str]]) -> List[dict]:
+    async with session.post(GRAPH, headers=_GQL_HEADERS,
+                            data=_dumps(_presign_batch_body(files))) as r:
+        if r.status >= 400:
+            raise requests.HTTPError(f"{r.status} {r.reason} – {(await r.text())[:400]}")
+        return _presign_batch_results(files, _loads(await r.read()))
+
+async def _upload_one(session: "aiohttp.ClientSession", sem: asyncio.Semaphore,
+                      image_path: str, presign: dict) -> str:
+    mime_type = _mime_type(image_path)
+    async with sem:  # cap the number of concurrent S3 uploads
+        with open(image_path, "rb", buffering=S3_READ_BUFFER) as f:
+            # encoded=True: keep the pre-signed query string byte-for-byte
+            async with session.put(URL(presign["url"], encoded=True), data=f,
+                                   headers=_s3_headers(image_path, mime_type)) as r:
+                if r.status // 100 != 2:
+                    raise requests.HTTPError(f"S3 PUT failed: {r.status} {(await r.text())[:300]}")
+    media_url = _finalize_location(
+        await _composer_proxy_async(session, _finalize_inner(presign["key"])))
+    print(f"✓ {os.path.basename(image_path)} → {media_url}")
+    return media_url
+
+def _aiohttp_session() -> "aiohttp.ClientSession":
+    connector = aiohttp.TCPConnector(limit=16, limit_per_host=8)
+    return aiohttp.ClientSession(headers=_SESSION_HEADERS,
+                                 cookie_jar=_aiohttp_cookie_jar(),
+                                 connector=connector)
+
+async def _upload_all(session: "aiohttp.ClientSession", image_paths: List[str],
+                      concurrency: int, return_exceptions: bool = False) -> list:
+    sem = asyncio.Semaphore(concurrency)
+    files = [(os.path.basename(p), _mime_type(p)) for p in image_paths]
+    presigns = await _presign_batch_async(session, files)  # one round-trip for all
+    return await asyncio.gather(*[_upload_one(session, sem, p, ps)
+                                  for p, ps in zip(image_paths, presigns)],
+                                return_exceptions=return_exceptions)
+
+async def _upload_many(image_paths: List[str], concurrency: int) -> List[str]:
+    async with _aiohttp_session() as session:
+        return await _upload_all(session, image_paths, concurrency)
+
+def upload_images_to_buffer(image_paths: List[str],
+                            concurrency: int = UPLOAD_CONCURRENCY) -> List[str]:
+    """Upload several images concurrently; returns media URLs in input order."""
+    if aiohttp is None:  # optional dependency — fall back to one at a time
+        return [upload_image_to_buffer(p) for p in image_paths]
+    print(f"Uploading {len(image_paths)} images (up to {concurrency} at a time)…")
+    return asyncio.run(_upload_many(image_paths, concurrency))
+
 # ---------- UI helpers ----------
-def get_available_images(directory: str) -> List[str]:
+_JPEG_SOF = frozenset(range(0xC0, 0xD0)) - {0xC4, 0xC8, 0xCC}
+
+def _fast_size(path: str) -> Optional[Tuple[int, int]]:
+    """(width, height) read straight from the file header, or None if unrecognized."""
+    try:
+        with open(path, "rb") as f:
+            head = f.read(32)
+            if head.startswith(b"\x89PNG\r\n\x1a\n"):
+                return struct.unpack(">II", head[16:24])
+            if head[:6] in (b"GIF87a", b"GIF89a"):
+                return struct.unpack("<HH", head[6:10])
+            if head[:2] == b"BM":
+                w, h = struct.unpack("<ii", head[18:26])
+                return w, abs(h)
+            if head[:4] == b"RIFF" and head[8:12] == b"WEBP":
+                chunk = head[12:16]
+                if chunk == b"VP8 ":   # lossy: 14-bit dims after the frame start code
+                    w, h = struct.unpack("<HH", head[26:30])
+                    return w & 0x3FFF, h & 0x3FFF
+                if chunk == b"VP8L":   # lossless: packed 14-bit (dim - 1) fields
+                    bits = int.from_bytes(head[21:25], "little")
+                    return (bits & 0x3FFF) + 1, ((bits >> 14) & 0x3FFF) + 1
+                if chunk == b"VP8X":   # extended: 24-bit (canvas dim - 1)
+                    return (int.from_bytes(head[24:27], "little") + 1,
+                            int.from_bytes(head[27:30], "little") + 1)
+                return None
+            if head[:2] == b"\xff\xd8":  # JPEG: hop segment to segment until SOFn
+                f.seek(2)
+                while True:
+                    marker = f.read(2)
+                    if len(marker) < 2 or marker[0] != 0xFF:
+                        return None
+                    m = marker[1]
+                    while m == 0xFF:  # fill bytes
+                        m = f.read(1)[0]
+                    if m in _JPEG_SOF:
+                        h, w = struct.unpack(">xxxHH", f.read(7))
+                        return w, h
+                    if m in (0xD9, 0xDA):  # EOI / start of scan without a SOF
+                        return None
+                    if m == 0x01 or 0xD0 <= m <= 0xD7:  # standalone markers
+                        continue
+                    f.seek(struct.unpack(">H", f.read(2))[0] - 2, 1)
+    except (OSError, struct.error, IndexError):
+        return None
+    return None
+
+def _image_size(path: str) -> Tuple[int, int]:
+    size = _fast_size(path)
+    if size is None:  # unknown magic — let PIL parse the header
+        with Image.open(path) as img:
+            size = img.size
+    return size
+
+def get_available_images(directory: str) -> List[Tuple[str, str, int]]:
+    """Sorted (name, path, size_bytes) for supported images; one scandir, all from DirEntry."""
     if not os.path.isabs(directory):
         script_dir = os.path.dirname(os.path.abspath(__file__))
         directory = os.path.join(script_dir, directory)
     if not os.path.exists(directory):
         return []
-    return sorted([f for f in os.listdir(directory)
-                   if any(f.lower().endswith(ext) for ext in SUPPORTED_FORMATS)])
+    with os.scandir(directory) as it:
+        entries = [(e.name, e.path, e.stat().st_size) for e in it
+                   if e.is_file() and os.path.splitext(e.name)[1].lower() in SUPPORTED_FORMATS]
+    entries.sort(key=lambda t: t[0])
+    return entries
 
-def display_images_menu(images_dir: str, images: List[str]) -> Optional[str]:
+def display_images_menu(images: List[Tuple[str, str, int]]) -> Optional[str]:
     if not images:
         print("No supported images found.")
         return None
     print("\n" + "="*50)
     print("AVAILABLE IMAGES")
     print("="*50)
-    for i, image in enumerate(images, 1):
+    for i, (image, path, size) in enumerate(images, 1):
         try:
-            with Image.open(os.path.join(images_dir, image)) as img:
-                w, h = img.size
-            size_kb = os.path.getsize(os.path.join(images_dir, image)) / 1024
+            w, h = _image_size(path)
+            size_kb = size / 1024
             print(f"{i:2d}. {image:<30} ({w}x{h}, {size_kb:.1f}KB)")
         except Exception:
             print(f"{i:2d}. {image:<30}")
@@ -189,7 +474,7 @@ def display_images_menu(images_dir: str, images: List[str]) -> Optional[str]:
         if choice.lower() == 'q':
             return None
         if choice.isdigit() and 1 <= int(choice) <= len(images):
-            return images[int(choice) - 1]
+            return images[int(choice) - 1][0]
         print("Please enter a valid number.")
 
 def ask(prompt: str, default: Optional[str] = None, allow_empty=False) -> str:
@@ -202,12 +487,14 @@ def ask(prompt: str, default: Optional[str] = None, allow_empty=False) -> str:
             return val
         print("  Please enter a value.")
 
+_SCHEME_RE = re.compile(r"^[a-zA-Z][a-zA-Z0-9+.\-]*://")
+
 def normalize_source_url(raw: str) -> Optional[str]:
     """Return a valid absolute URL or None (omit). Auto-add https:// when missing."""
     raw = (raw or "").strip()
     if not raw:
         return None
-    if not re.match(r"^[a-zA-Z][a-zA-Z0-9+.\-]*://", raw):
+    if not _SCHEME_RE.match(raw):
         raw = "https://" + raw
     p = urlparse(raw)
     if not p.scheme or not p.netloc:
@@ -215,10 +502,9 @@ def normalize_source_url(raw: str) -> Optional[str]:
     return raw
 
 # ---------- schedule ----------
-def schedule_pin(cookie_header: str,
-                 profile_id: str, board_id: str,
-                 text: str, title: str, media_url: str, source_url: Optional[str],
-                 share_now: bool = False, due_at: Optional[int] = None):
+def _schedule_inner(profile_id: str, board_id: str,
+                    text: str, title: str, media_url: str, source_url: Optional[str],
+                    share_now: bool = False, due_at: Optional[int] = None) -> dict:
     media = {
         "progress": 100,
         "uploaded": True,
@@ -260,31 +546,80 @@ def schedule_pin(cookie_header: str,
     if due_at is not None:
         args["due_at"] = int(due_at)
 
-    inner = {"url": "/1/updates/create.json", "args": args, "HTTPMethod": "POST"}
-    return composer_proxy(cookie_header, inner)
+    return {"url": "/1/updates/create.json", "args": args, "HTTPMethod": "POST"}
 
-# ---------- main ----------
-def main():
-    print("🔥 Pinterest Buffer Scheduler")
-    print("="*50)
+def schedule_pin(profile_id: str, board_id: str,
+                 text: str, title: str, media_url: str, source_url: Optional[str],
+                 share_now: bool = False, due_at: Optional[int] = None):
+    return composer_proxy(_schedule_inner(profile_id, board_id, text, title, media_url,
+                                          source_url, share_now=share_now, due_at=due_at))
 
-    # cookies
-    try:
-        allcookies = parse_cookies_txt(COOKIES_TXT_PATH)
-        cookie_header = build_cookie_header(allcookies, COOKIE_WHITELIST)
-    except Exception as e:
-        print(f"❌ Error with cookies: {e}")
-        return
+# ---------- batch ----------
+BATCH_COLUMNS = ("image", "title", "description", "source_url", "due_at")
+_TITLE_TRANS = str.maketrans("_-", "  ")  # file-name separators → spaces
 
-    # optional slots
+def default_title(filename: str) -> str:
+    return os.path.splitext(os.path.basename(filename))[0].translate(_TITLE_TRANS).title()
+
+def load_batch_csv(path: str) -> List[dict]:
+    """Read pin jobs from a CSV with columns image,title,description,source_url,due_at."""
+    jobs = []
+    with open(path, newline="", encoding="utf-8-sig") as f:
+        for lineno, row in enumerate(csv.DictReader(f), 2):
+            image = (row.get("image") or "").strip()
+            if not image:
+                raise ValueError(f"{path}:{lineno}: missing 'image'")
+            due_at = (row.get("due_at") or "").strip()
+            jobs.append({
+                "image": image,
+                "title": (row.get("title") or "").strip() or default_title(image),
+                "description": (row.get("description") or "").strip(),
+                "source_url": normalize_source_url(row.get("source_url")),
+                "due_at": int(due_at) if due_at else None,
+            })
+    return jobs
+
+def _job_inner(job: dict, media_url: str) -> dict:
+    return _schedule_inner(PROFILE_ID, BOARD_ID, job["description"], job["title"],
+                           media_url, job["source_url"], due_at=job["due_at"])
+
+async def _schedule_many(session: "aiohttp.ClientSession", jobs: List[dict],
+                         media_urls: list, concurrency: int) -> list:
+    sem = asyncio.Semaphore(concurrency)
+
+    async def schedule_one(job: dict, media_url):
+        if isinstance(media_url, BaseException):  # upload failed — nothing to schedule
+            return media_url
+        async with sem:
+            return await _composer_proxy_async(session, _job_inner(job, media_url))
+
+    return await asyncio.gather(*[schedule_one(j, u) for j, u in zip(jobs, media_urls)],
+                                return_exceptions=True)
+
+async def _run_batch(jobs: List[dict], concurrency: int) -> list:
     try:
-        slots = get_slots(cookie_header, PROFILE_ID, SLOTS_START, SLOTS_END)
-        if isinstance(slots, dict) and slots:
-            first_day = sorted(slots.keys())[0]
-            print("Slots sample:", first_day, slots[first_day][:2])
-    except Exception as e:
-        print("Slots fetch skipped (non-fatal):", e)
+        async with _aiohttp_session() as session:
+            media_urls = await _upload_all(session, [j["image"] for j in jobs], concurrency,
+                                           return_exceptions=True)
+            return await _schedule_many(session, jobs, media_urls, concurrency)
+    except Exception as e:  # shared presign or connection failed — no job got through
+        return [e] * len(jobs)
+
+def run_batch(jobs: List[dict], concurrency: int = UPLOAD_CONCURRENCY) -> list:
+    """Upload + schedule every job; returns per-job results (or the exception raised)."""
+    if aiohttp is None:  # optional dependency — one job at a time
+        results = []
+        for job in jobs:
+            try:
+                media_url = upload_image_to_buffer(job["image"])
+                results.append(composer_proxy(_job_inner(job, media_url)))
+            except Exception as e:
+                results.append(e)
+        return results
+    return asyncio.run(_run_batch(jobs, concurrency))
 
+# ---------- main ----------
+def interactive():
     # list images
     images_dir = IMAGES_DIRECTORY if os.path.isabs(IMAGES_DIRECTORY) else os.path.join(os.path.dirname(os.path.abspath(__file__)), IMAGES_DIRECTORY)
     images = get_available_images(IMAGES_DIRECTORY)
@@ -293,7 +628,7 @@ def main():
         print("Please add .jpg/.png/.webp/.gif/.bmp files to that folder.")
         return
 
-    chosen = display_images_menu(images_dir, images)
+    chosen = display_images_menu(images)
     if not chosen:
         print("Cancelled.")
         return
@@ -302,8 +637,7 @@ def main():
     print(f"\n✓ Selected: {chosen}")
 
     # details
-    default_title = os.path.splitext(chosen)[0].replace("_", " ").replace("-", " ").title()
-    title = ask("Enter pin title", default=default_title)
+    title = ask("Enter pin title", default=default_title(chosen))
     description = ask("Enter pin description (optional)", default="", allow_empty=True)
     src_raw = ask("Enter source URL (optional)", default="", allow_empty=True)
     source_url = normalize_source_url(src_raw)
@@ -316,14 +650,95 @@ def main():
         return
 
     try:
-        media_url = upload_image_to_buffer(cookie_header, image_path)
+        media_url = upload_image_to_buffer(image_path)
         print("\nScheduling pin…")
-        result = schedule_pin(cookie_header, PROFILE_ID, BOARD_ID,
+        result = schedule_pin(PROFILE_ID, BOARD_ID,
                               description, title, media_url, source_url)
         print("\n✅ SUCCESS!")
         print(json.dumps(result, indent=2))
     except Exception as e:
         print(f"\n❌ Error: {e}")
 
+def cli_upload(opts: argparse.Namespace):
+    source_url = normalize_source_url(opts.source_url)
+    if opts.source_url and not source_url:
+        print("⚠️  The source URL looked invalid; it will be omitted.")
+    try:
+        media_url = upload_image_to_buffer(opts.image)
+        print("\nScheduling pin…")
+        result = schedule_pin(PROFILE_ID, BOARD_ID, opts.description,
+                              opts.title or default_title(opts.image),
+                              media_url, source_url, due_at=opts.due_at)
+        print("\n✅ SUCCESS!")
+        print(json.dumps(result, indent=2))
+    except Exception as e:
+        print(f"\n❌ Error: {e}")
+
+def cli_batch(opts: argparse.Namespace):
+    try:
+        jobs = load_batch_csv(opts.csv)
+    except (OSError, ValueError) as e:
+        print(f"❌ Error reading {opts.csv}: {e}")
+        return
+    if not jobs:
+        print("Nothing to do: the CSV has no rows.")
+        return
+    results = run_batch(jobs, opts.concurrency)
+    print("\n" + "="*50)
+    failed = 0
+    for job, result in zip(jobs, results):
+        if isinstance(result, BaseException):
+            failed += 1
+            print(f"❌ {job['image']}: {result}")
+        else:
+            print(f"✅ {job['image']} → {job['title']}")
+    print(f"{len(jobs) - failed}/{len(jobs)} pins scheduled.")
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(
+        description="Upload images and schedule them as Pinterest pins via Buffer. "
+                    "Run without a command for the interactive menu.")
+    parser.add_argument("--no-cache", action="store_true",
+                        help="always refetch queue slots instead of using the local cache")
+    sub = parser.add_subparsers(dest="command")
+    up = sub.add_parser("upload", help="upload one image and schedule it")
+    up.add_argument("--image", required=True, help="path to the image file")
+    up.add_argument("--title", help="pin title (default: derived from the file name)")
+    up.add_argument("--description", default="", help="pin description")
+    up.add_argument("--source-url", default="", help="link the pin points to")
+    up.add_argument("--due-at", type=int, help="unix timestamp; omit to add to the queue")
+    batch = sub.add_parser("batch", help="upload + schedule every row of a CSV concurrently")
+    batch.add_argument("csv", help="CSV with columns: " + ",".join(BATCH_COLUMNS))
+    batch.add_argument("--concurrency", type=int, default=UPLOAD_CONCURRENCY,
+                       help=f"parallel uploads/schedules (default {UPLOAD_CONCURRENCY})")
+    opts = parser.parse_args(argv)
+
+    print("🔥 Pinterest Buffer Scheduler")
+    print("="*50)
+
+    # cookies
+    try:
+        allcookies = parse_cookies_txt(COOKIES_TXT_PATH, os.path.getmtime(COOKIES_TXT_PATH))
+        apply_session_cookies(allcookies, COOKIE_WHITELIST)
+    except Exception as e:
+        print(f"❌ Error with cookies: {e}")
+        return
+
+    # optional slots
+    try:
+        slots = get_slots_cached(PROFILE_ID, SLOTS_START, SLOTS_END, use_cache=not opts.no_cache)
+        if isinstance(slots, dict) and slots:
+            first_day = sorted(slots.keys())[0]
+            print("Slots sample:", first_day, slots[first_day][:2])
+    except Exception as e:
+        print("Slots fetch skipped (non-fatal):", e)
+
+    if opts.command == "upload":
+        cli_upload(opts)
+    elif opts.command == "batch":
+        cli_batch(opts)
+    else:
+        interactive()
+
 if __name__ == "__main__":
     main()
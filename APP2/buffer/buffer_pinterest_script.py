@@ -5,8 +5,25 @@ import time
 from datetime import datetime, timedelta
 import uuid
 import re
+from http.cookiejar import LoadError, MozillaCookieJar
+from itertools import islice
+from requests.cookies import create_cookie
 
 class BufferPinterest:
+    # Diagnostic patterns for analyze_buffer_javascript, compiled once
+    RPC_PATTERNS = [
+        ("rpc", re.compile(r'rpc["\']?\s*[:=]\s*([^,}\]]+)', re.IGNORECASE)),
+        ("proxy", re.compile(r'composerApiProxy["\']?\s*[:=]\s*([^,}\]]+)', re.IGNORECASE)),
+        ("publish", re.compile(r'publish["\']?\s*[:=]\s*([^,}\]]+)', re.IGNORECASE)),
+        ("globals", re.compile(r'window\.[A-Z_]+\s*=\s*["\']([^"\']+)["\']', re.IGNORECASE)),
+    ]
+    INIT_PATTERNS = [
+        re.compile(r'window\.Buffer\s*=\s*({[^}]+})'),
+        re.compile(r'window\.App\s*=\s*({[^}]+})'),
+        re.compile(r'window\.Config\s*=\s*({[^}]+})'),
+        re.compile(r'__INITIAL_STATE__\s*=\s*({.+?});'),
+    ]
+
     def __init__(self, cookies_file):
         self.session = requests.Session()
         self.base_url = "https://publish.buffer.com"
@@ -18,15 +35,23 @@ class BufferPinterest:
         self.lunch_ideas_board_id = "688cbbf56cac34c8300f037e"
         
     def load_cookies(self, cookies_file):
-        with open(cookies_file, 'r') as f:
-            content = f.read()
-            
-        for line in content.split('\n'):
-            if line.strip() and not line.startswith('#'):
-                parts = line.strip().split('\t')
-                if len(parts) >= 7:
-                    domain, _, path, secure, expires, name, value = parts[:7]
-                    self.session.cookies.set(name, value, domain=domain, path=path)
+        jar = MozillaCookieJar()
+        try:
+            # native Netscape parser; also understands #HttpOnly_ rows
+            jar.load(cookies_file, ignore_discard=True, ignore_expires=True)
+            for cookie in jar:
+                if cookie.expires == 0:  # exporters write 0 for session cookies
+                    cookie.expires = None
+        except LoadError:
+            # exports without the "# Netscape HTTP Cookie File" header line
+            with open(cookies_file, 'r') as f:
+                for line in f:
+                    if line.strip() and not line.startswith('#'):
+                        parts = line.strip().split('\t')
+                        if len(parts) >= 7:
+                            domain, _, path, secure, expires, name, value = parts[:7]
+                            jar.set_cookie(create_cookie(name, value, domain=domain, path=path))
+        self.session.cookies = jar
         print("✅ Cookies loaded")
     
     def analyze_buffer_javascript(self):
@@ -42,36 +67,16 @@ class BufferPinterest:
             
             print(f"📄 Found {len(js_files)} JavaScript files")
             
-            # Look for RPC-related patterns in the HTML
-            rpc_patterns = [
-                r'rpc["\']?\s*[:=]\s*([^,}\]]+)',
-                r'composerApiProxy["\']?\s*[:=]\s*([^,}\]]+)',
-                r'publish["\']?\s*[:=]\s*([^,}\]]+)',
-                r'window\.[A-Z_]+\s*=\s*["\']([^"\']+)["\']'
-            ]
-            
             findings = {}
-            for pattern_name, pattern in [
-                ("rpc", rpc_patterns[0]),
-                ("proxy", rpc_patterns[1]), 
-                ("publish", rpc_patterns[2]),
-                ("globals", rpc_patterns[3])
-            ]:
-                matches = re.findall(pattern, content, re.IGNORECASE)
+            for pattern_name, pattern in self.RPC_PATTERNS:
+                matches = [m.group(1) for m in islice(pattern.finditer(content), 5)]  # First 5 matches
                 if matches:
-                    findings[pattern_name] = matches[:5]  # First 5 matches
+                    findings[pattern_name] = matches
                     print(f"🔍 {pattern_name}: {matches[:3]}")
             
             # Look for specific initialization patterns
-            init_patterns = [
-                r'window\.Buffer\s*=\s*({[^}]+})',
-                r'window\.App\s*=\s*({[^}]+})',
-                r'window\.Config\s*=\s*({[^}]+})',
-                r'__INITIAL_STATE__\s*=\s*({.+?});'
-            ]
-            
-            for pattern in init_patterns:
-                match = re.search(pattern, content)
+            for pattern in self.INIT_PATTERNS:
+                match = pattern.search(content)
                 if match:
                     print(f"📋 Found initialization data: {match.group(1)[:100]}...")
             
@@ -226,9 +231,10 @@ def main():
     print("=== BUFFER ANALYSIS & WORKING SOLUTIONS ===")
     print("Final attempt to understand Buffer + Working alternatives\n")
     
-    # Test 1: Analyze Buffer's JavaScript
-    print("=== ANALYSIS: Buffer JavaScript ===")
-    js_findings = scheduler.analyze_buffer_javascript()
+    # Test 1: Analyze Buffer's JavaScript (diagnostic only — fetches the whole app page)
+    if os.environ.get("BUFFER_DEBUG"):
+        print("=== ANALYSIS: Buffer JavaScript ===")
+        js_findings = scheduler.analyze_buffer_javascript()
     
     # Test 2: Create working Pinterest automation alternative
     print("\n=== WORKING SOLUTION: Pinterest Alternatives ===")
@@ -8,11 +8,71 @@ import os
 # smart_color_pinterest_replica.py
 # Creates Pinterest templates with automatic color detection
 # pip install Pillow numpy
+#   (pillow-simd is a drop-in replacement with SSE4/AVX2 resize kernels; same API)
 
-from PIL import Image, ImageDraw, ImageFont
+from PIL import Image, ImageColor, ImageDraw, ImageFilter, ImageFont
 import numpy as np
 import os
-from collections import Counter
+from collections import Counter, OrderedDict
+from functools import lru_cache
+import threading
+
+# Filter for the visible image sections (detection thumbnails use BOX)
+_RESAMPLE = Image.Resampling.LANCZOS
+
+# Bold font candidates, first existing one wins
+FONT_PATHS = [
+    # Windows
+    "C:/Windows/Fonts/arialbd.ttf",
+    "C:/Windows/Fonts/arial.ttf",
+    # Mac
+    "/System/Library/Fonts/Arial Bold.ttf",
+    "/System/Library/Fonts/Arial.ttf",
+    # Linux
+    "/usr/share/fonts/truetype/dejavu/DejaVuSans-Bold.ttf",
+]
+_FONT_PATH = next((p for p in FONT_PATHS if os.path.exists(p)), None)
+
+@lru_cache(maxsize=16)
+def _load_font(size: int) -> ImageFont.FreeTypeFont:
+    """Parse the font once per size and reuse the FreeType face across templates"""
+    if _FONT_PATH:
+        try:
+            return ImageFont.truetype(_FONT_PATH, size)
+        except OSError:
+            pass
+    return ImageFont.load_default()
+
+# Title-independent backgrounds, so several titles over one image only resize/detect once
+_BASE_CACHE: OrderedDict = OrderedDict()
+_BASE_CACHE_LOCK = threading.Lock()
+_BASE_CACHE_SIZE = 8
+
+# Canvases recycled across templates in batch runs
+_CANVAS_POOL: list[Image.Image] = []
+_CANVAS_POOL_LOCK = threading.Lock()
+_CANVAS_POOL_SIZE = 4
+
+def _acquire_canvas(size: tuple[int, int], clear: bool = True) -> Image.Image:
+    """White RGB canvas, reused from the pool when one of this size is free.
+    Pass clear=False when the caller paints over the whole canvas anyway."""
+    canvas = None
+    with _CANVAS_POOL_LOCK:
+        for i, pooled in enumerate(_CANVAS_POOL):
+            if pooled.size == size:
+                canvas = _CANVAS_POOL.pop(i)
+                break
+    if canvas is None:
+        return Image.new('RGB', size, 'white')
+    if clear:
+        canvas.paste('white', (0, 0) + size)
+    return canvas
+
+def _release_canvas(image: Image.Image):
+    """Return a saved canvas to the pool; the caller must not touch it afterwards"""
+    with _CANVAS_POOL_LOCK:
+        if len(_CANVAS_POOL) < _CANVAS_POOL_SIZE:
+            _CANVAS_POOL.append(image)
 
 class SmartColorPinterestGenerator:
     def __init__(self):
@@ -28,6 +88,21 @@ class SmartColorPinterestGenerator:
         # Default colors
         self.default_color = '#FF9800'  # Orange fallback
         self.text_color = '#FFFFFF'
+        
+        # Dotted border decorations, stamped once into a mask strip
+        self.dot_size = 4
+        self.dot_spacing = 12
+        self.dot_margin = 20
+        self._dot_strip = self._build_dot_strip()
+    
+    def _build_dot_strip(self) -> Image.Image:
+        """One row of border dots as an 'L' mask, pasted whole per dotted line"""
+        xs = range(0, self.canvas_width - 2 * self.dot_margin, self.dot_spacing)
+        strip = Image.new('L', (xs[-1] + self.dot_size + 1, self.dot_size + 1), 0)
+        draw = ImageDraw.Draw(strip)
+        for x in xs:
+            draw.rectangle([x, 0, x + self.dot_size, self.dot_size], fill=255)
+        return strip
     
     def detect_dominant_color(self, image: Image.Image) -> str:
         """
@@ -40,50 +115,27 @@ class SmartColorPinterestGenerator:
             Hex color string
         """
         try:
-            # Resize image for faster processing
-            small_img = image.resize((100, 100), Image.Resampling.LANCZOS)
-            
-            # Convert to numpy array
-            img_array = np.array(small_img)
+            # Resize image for faster processing (a box average is plenty for a histogram)
+            small_img = image.resize((100, 100), Image.Resampling.BOX)
             
-            # Reshape to list of pixels
-            pixels = img_array.reshape(-1, 3)
+            # Quantize to a 16-color palette in C; getcolors gives pixel counts per entry
+            quantized = small_img.quantize(colors=16, method=Image.Quantize.FASTOCTREE)
+            palette = np.array(quantized.getpalette(), dtype=np.uint8).reshape(-1, 3)
+            entries = sorted(quantized.getcolors(), key=lambda entry: entry[1])
+            counts = np.array([count for count, _ in entries])
+            unique_colors = palette[[index for _, index in entries]]
             
-            # Remove very light pixels (whites/grays)
-            mask = ~((pixels[:, 0] > 240) & (pixels[:, 1] > 240) & (pixels[:, 2] > 240))
-            filtered_pixels = pixels[mask]
+            # Remove very light colors (whites/grays): one min reduction, no per-channel temporaries
+            mask = unique_colors.min(axis=1) <= 240
             
-            if len(filtered_pixels) == 0:
+            if not mask.any():
                 return self.default_color
             
-            # Group similar colors (reduce precision for clustering)
-            grouped_pixels = (filtered_pixels // 32) * 32
-            
-            # Count color frequencies
-            unique_colors, counts = np.unique(grouped_pixels, axis=0, return_counts=True)
+            unique_colors = unique_colors[mask]
+            counts = counts[mask]
             
-            # Find most vibrant colors
-            best_color = None
-            best_score = 0
-            
-            for i, (color, count) in enumerate(zip(unique_colors, counts)):
-                r, g, b = color
-                
-                # Calculate color vibrancy (saturation)
-                max_val = max(r, g, b)
-                min_val = min(r, g, b)
-                saturation = 0 if max_val == 0 else (max_val - min_val) / max_val
-                
-                # Calculate brightness
-                brightness = (r * 299 + g * 587 + b * 114) / 1000
-                
-                # Score based on frequency, saturation, and brightness
-                vibrancy_score = saturation * 0.6 + (brightness / 255) * 0.2 + (count / len(filtered_pixels)) * 0.2
-                
-                # Prefer colors that aren't too dark or too bright
-                if 80 < brightness < 200 and saturation > 0.2 and vibrancy_score > best_score:
-                    best_score = vibrancy_score
-                    best_color = color
+            # Find most vibrant color, scoring every palette entry at once
+            best_color = self._most_vibrant(unique_colors, counts)
             
             if best_color is not None:
                 r, g, b = best_color
@@ -110,48 +162,98 @@ class SmartColorPinterestGenerator:
         
         return self.default_color
     
-    def load_font(self, size: int) -> ImageFont.FreeTypeFont:
-        """Load bold font with fallbacks"""
-        font_paths = [
-            # Windows
-            "C:/Windows/Fonts/arialbd.ttf",
-            "C:/Windows/Fonts/arial.ttf",
-            # Mac
-            "/System/Library/Fonts/Arial Bold.ttf",
-            "/System/Library/Fonts/Arial.ttf",
-            # Linux
-            "/usr/share/fonts/truetype/dejavu/DejaVuSans-Bold.ttf",
-        ]
-        
-        for font_path in font_paths:
-            try:
-                if os.path.exists(font_path):
-                    return ImageFont.truetype(font_path, size)
-            except:
-                continue
-        
-        return ImageFont.load_default()
+    def _most_vibrant(self, colors: np.ndarray, counts: np.ndarray):
+        """Pick the best banner candidate from (N, 3) colors and their pixel counts"""
+        # int16 is enough for max - min; everything fractional stays float32
+        rgb = colors.astype(np.int16)
+        max_val = rgb.max(axis=1)
+        min_val = rgb.min(axis=1)
+        saturation = (max_val - min_val).astype(np.float32) / np.maximum(max_val, 1)
+        brightness = (rgb @ np.array([299, 587, 114], dtype=np.int32)).astype(np.float32) / 1000
+        frequency = counts.astype(np.float32) / counts.sum()
+        
+        # Score based on saturation, brightness and frequency
+        score = saturation * 0.6 + (brightness / 255) * 0.2 + frequency * 0.2
+        
+        # Prefer colors that aren't too dark or too bright
+        score[~((brightness > 80) & (brightness < 200) & (saturation > 0.2))] = -1
+        
+        best = int(score.argmax())
+        if score[best] < 0:
+            return None
+        return tuple(int(v) for v in rgb[best])
+    
+    def _fit_section(self, image: Image.Image, height: int) -> Image.Image:
+        """Scale to canvas width and center-crop (or letterbox) to height"""
+        scaled_height = int(self.canvas_width / (image.width / image.height))
+        
+        if scaled_height >= height:
+            # Resample only the source rows that survive the crop
+            scale = image.height / scaled_height
+            top = (scaled_height - height) // 2 * scale
+            return image.resize((self.canvas_width, height), _RESAMPLE,
+                                box=(0, top, image.width, top + height * scale))
+        
+        return self._center_section(self._scale_to_width(image), height)
+    
+    def _scale_to_width(self, image: Image.Image) -> Image.Image:
+        """Resize to canvas width, keeping aspect ratio"""
+        scaled_height = int(self.canvas_width / (image.width / image.height))
+        return image.resize((self.canvas_width, scaled_height), _RESAMPLE)
+    
+    def _center_section(self, resized: Image.Image, height: int) -> Image.Image:
+        """Center-crop a canvas-wide image to height, or letterbox it on white"""
+        if resized.height >= height:
+            crop_start = (resized.height - height) // 2
+            return resized.crop((0, crop_start, resized.width, crop_start + height))
+        
+        section = Image.new('RGB', (self.canvas_width, height), 'white')
+        section.paste(resized, (0, (height - resized.height) // 2))
+        return section
+    
+    def _detection_thumbnail(self, source_image_path: str) -> Image.Image:
+        """Small RGB copy of the source for color detection; JPEGs decode at reduced scale"""
+        with Image.open(source_image_path) as img:
+            img.draft('RGB', (200, 200))
+            return img.convert('RGB').resize((100, 100), Image.Resampling.BOX)
     
-    def create_color_matched_template(self, source_image_path: str, title: str, use_auto_color: bool = True, manual_color: str = None) -> tuple[Image.Image, str]:
-        """
-        Create Pinterest template with smart color detection
-        
-        Args:
-            source_image_path: Path to source image (single or grid)
-            title: Title text for banner
-            use_auto_color: Whether to auto-detect color or use manual
-            manual_color: Manual color if not using auto-detection
-            
-        Returns:
-            Tuple of (generated_image, detected_color)
-        """
-        
-        # Open source image
-        source_img = Image.open(source_image_path).convert('RGB')
+    def load_font(self, size: int) -> ImageFont.FreeTypeFont:
+        """Load bold font with fallbacks (cached per size)"""
+        return _load_font(size)
+    
+    def _base_canvas(self, source_image_path: str, use_auto_color: bool, manual_color: str) -> tuple[Image.Image, str]:
+        """Title-independent background (sections, banner, dots), cached per source file and settings"""
+        key = (os.path.abspath(source_image_path), os.path.getmtime(source_image_path),
+               use_auto_color, None if use_auto_color else manual_color, self.default_color,
+               self.canvas_width, self.canvas_height, self.top_image_height, self.banner_height)
+        
+        with _BASE_CACHE_LOCK:
+            cached = _BASE_CACHE.get(key)
+            if cached:
+                _BASE_CACHE.move_to_end(key)
+        if cached:
+            print(f"♻️  Reusing background for {os.path.basename(source_image_path)}: {cached[1]}")
+            return cached
+        
+        cached = self._build_base_canvas(source_image_path, use_auto_color, manual_color)
+        with _BASE_CACHE_LOCK:
+            _BASE_CACHE[key] = cached
+            while len(_BASE_CACHE) > _BASE_CACHE_SIZE:
+                _BASE_CACHE.popitem(last=False)
+        return cached
+    
+    def _build_base_canvas(self, source_image_path: str, use_auto_color: bool, manual_color: str) -> tuple[Image.Image, str]:
+        """Everything in the template except the title text"""
+        # Open source image; JPEGs decode at a reduced DCT scale that still leaves
+        # every section (grid quadrants included) at least canvas-wide
+        source_img = Image.open(source_image_path)
+        draft_width = self.canvas_width * 2
+        source_img.draft('RGB', (draft_width, max(1, draft_width * source_img.height // source_img.width)))
+        source_img = source_img.convert('RGB')
         
         # Detect color
         if use_auto_color:
-            detected_color = self.detect_dominant_color(source_img)
+            detected_color = self.detect_dominant_color(self._detection_thumbnail(source_image_path))
             print(f"🎨 Color detected from image: {detected_color}")
         else:
             detected_color = manual_color or self.default_color
@@ -184,110 +286,119 @@ class SmartColorPinterestGenerator:
             bottom_image = source_img
             print(f"📸 Single image mode")
         
-        # Process TOP section
-        top_aspect = top_image.width / top_image.height
-        top_scaled_width = self.canvas_width
-        top_scaled_height = int(top_scaled_width / top_aspect)
-        
-        top_resized = top_image.resize((top_scaled_width, top_scaled_height), Image.Resampling.LANCZOS)
-        
-        if top_scaled_height >= self.top_image_height:
-            crop_start = (top_scaled_height - self.top_image_height) // 2
-            top_final = top_resized.crop((0, crop_start, top_scaled_width, 
-                                        crop_start + self.top_image_height))
+        if top_image is bottom_image:
+            # Both sections come from one image: resample only the taller section's
+            # rows once, then center-crop the shorter section out of it
+            if self.top_image_height >= self.bottom_image_height:
+                top_final = self._fit_section(top_image, self.top_image_height)
+                bottom_final = self._center_section(top_final, self.bottom_image_height)
+            else:
+                bottom_final = self._fit_section(top_image, self.bottom_image_height)
+                top_final = self._center_section(bottom_final, self.top_image_height)
         else:
-            top_section = Image.new('RGB', (self.canvas_width, self.top_image_height), 'white')
-            paste_y = (self.top_image_height - top_scaled_height) // 2
-            top_section.paste(top_resized, (0, paste_y))
-            top_final = top_section
+            top_final = self._fit_section(top_image, self.top_image_height)
+            bottom_final = self._fit_section(bottom_image, self.bottom_image_height)
         
+        # Process TOP section
         canvas.paste(top_final, (0, 0))
         
         # Process BOTTOM section
-        bottom_aspect = bottom_image.width / bottom_image.height
-        bottom_scaled_width = self.canvas_width
-        bottom_scaled_height = int(bottom_scaled_width / bottom_aspect)
-        
-        bottom_resized = bottom_image.resize((bottom_scaled_width, bottom_scaled_height), 
-                                           Image.Resampling.LANCZOS)
-        
         bottom_y = self.top_image_height + self.banner_height
-        
-        if bottom_scaled_height >= self.bottom_image_height:
-            crop_start = (bottom_scaled_height - self.bottom_image_height) // 2
-            bottom_final = bottom_resized.crop((0, crop_start, bottom_scaled_width,
-                                              crop_start + self.bottom_image_height))
-        else:
-            bottom_section = Image.new('RGB', (self.canvas_width, self.bottom_image_height), 'white')
-            paste_y = (self.bottom_image_height - bottom_scaled_height) // 2
-            bottom_section.paste(bottom_resized, (0, paste_y))
-            bottom_final = bottom_section
-        
         canvas.paste(bottom_final, (0, bottom_y))
         
-        # CREATE COLOR-MATCHED BANNER
-        draw = ImageDraw.Draw(canvas)
+        # Free the decoded source and section buffers before the banner/text stage
+        for image in (top_final, bottom_final, top_image, bottom_image, source_img):
+            image.close()
+        del source_img, top_image, bottom_image, top_final, bottom_final
         
-        # Draw banner background with detected color
+        # CREATE COLOR-MATCHED BANNER
+        # Fill banner background with detected color (C fill; box matches the old inclusive rectangle)
         banner_y = self.top_image_height
-        draw.rectangle([0, banner_y, self.canvas_width, banner_y + self.banner_height], 
-                      fill=detected_color)
+        canvas.paste(ImageColor.getrgb(detected_color),
+                     (0, banner_y, self.canvas_width, banner_y + self.banner_height + 1))
         
         # ADD DOTTED BORDER DECORATIONS
-        dot_size = 4
-        dot_spacing = 12
-        margin = 20
-        
         # Top dotted line
-        for x in range(margin, self.canvas_width - margin, dot_spacing):
-            draw.rectangle([x, banner_y + 15, x + dot_size, banner_y + 15 + dot_size], 
-                          fill='white')
+        canvas.paste('white', (self.dot_margin, banner_y + 15), self._dot_strip)
         
         # Bottom dotted line
-        for x in range(margin, self.canvas_width - margin, dot_spacing):
-            draw.rectangle([x, banner_y + self.banner_height - 19, 
-                          x + dot_size, banner_y + self.banner_height - 15], 
-                          fill='white')
+        canvas.paste('white', (self.dot_margin, banner_y + self.banner_height - 19), self._dot_strip)
+        
+        return canvas, detected_color
+    
+    def create_color_matched_template(self, source_image_path: str, title: str, use_auto_color: bool = True, manual_color: str = None) -> tuple[Image.Image, str]:
+        """
+        Create Pinterest template with smart color detection
+        
+        Args:
+            source_image_path: Path to source image (single or grid)
+            title: Title text for banner
+            use_auto_color: Whether to auto-detect color or use manual
+            manual_color: Manual color if not using auto-detection
+            
+        Returns:
+            Tuple of (generated_image, detected_color)
+        """
+        
+        base, detected_color = self._base_canvas(source_image_path, use_auto_color, manual_color)
+        
+        # Create canvas (pooled; release it with _release_canvas once saved).
+        # The full-size base covers it, so a recycled canvas needs no clear.
+        canvas = _acquire_canvas((self.canvas_width, self.canvas_height), clear=False)
+        canvas.paste(base, (0, 0))
+        draw = ImageDraw.Draw(canvas)
+        banner_y = self.top_image_height
         
         # ADD TEXT WITH ENHANCED READABILITY
         font_size = 38
         font = self.load_font(font_size)
         
-        # Split text into lines
+        # Split text into lines, measuring each word once and keeping a running width
         words = title.upper().split()
         max_width = self.canvas_width - 80
+        space_width = font.getlength(' ')
         lines = []
-        current_line = ''
+        current_words = []
+        current_width = 0
         
         for word in words:
-            test_line = current_line + (' ' if current_line else '') + word
-            bbox = draw.textbbox((0, 0), test_line, font=font)
-            text_width = bbox[2] - bbox[0]
+            word_width = font.getlength(word)
+            text_width = current_width + space_width + word_width if current_words else word_width
             
-            if text_width > max_width and current_line:
-                lines.append(current_line)
-                current_line = word
+            if text_width > max_width and current_words:
+                lines.append(' '.join(current_words))
+                current_words = [word]
+                current_width = word_width
             else:
-                current_line = test_line
+                current_words.append(word)
+                current_width = text_width
         
-        if current_line:
-            lines.append(current_line)
+        if current_words:
+            lines.append(' '.join(current_words))
         
         # Calculate text positioning
         line_height = 42
         total_text_height = len(lines) * line_height
         start_y = banner_y + (self.banner_height - total_text_height) // 2
         
-        # Draw text with enhanced shadow for readability
+        positions = []
         for i, line in enumerate(lines):
-            bbox = draw.textbbox((0, 0), line, font=font)
-            text_width = bbox[2] - bbox[0]
-            x = (self.canvas_width - text_width) // 2
+            text_width = font.getlength(line)
+            x = int(self.canvas_width - text_width) // 2
             y = start_y + (i * line_height)
-            
-            # Enhanced shadow for better contrast
-            draw.text((x + 3, y + 3), line, font=font, fill='rgba(0,0,0,0.5)')
-            draw.text((x + 1, y + 1), line, font=font, fill='rgba(0,0,0,0.3)')
+            positions.append((x, y, line))
+        
+        # Soft shadow for readability: all lines in one mask, blurred, black composited through it
+        pad = 8
+        shadow = Image.new('L', (self.canvas_width, total_text_height + 2 * pad), 0)
+        shadow_draw = ImageDraw.Draw(shadow)
+        for x, y, line in positions:
+            shadow_draw.text((x + 2, y - start_y + pad + 2), line, font=font, fill=140)
+        shadow = shadow.filter(ImageFilter.GaussianBlur(2))
+        canvas.paste('black', (0, start_y - pad), shadow)
+        
+        # Crisp text on top, single pass
+        for x, y, line in positions:
             draw.text((x, y), line, font=font, fill=self.text_color)
         
         return canvas, detected_color
@@ -318,6 +429,7 @@ def create_smart_color_template(source_image_path: str, title: str, output_path:
         source_image_path, title, use_auto_color, manual_color
     )
     generator.save_template(template, output_path)
+    _release_canvas(template)
     
     return output_path, detected_color
 
@@ -366,6 +478,7 @@ def generate_color_matched_pinterest_template(image_path: str, title: str, outpu
     generator = SmartColorPinterestGenerator()
     template, detected_color = generator.create_color_matched_template(image_path, title)
     generator.save_template(template, output_path)
+    _release_canvas(template)
     
     return output_path, detected_color
     
@@ -1,98 +1,173 @@
-import React, { useState, useRef, useEffect } from 'react';
+import React, { useState, useRef, useEffect, useMemo } from 'react';
 import { Upload, Download, Type, Palette, Move, RotateCcw, Eye } from 'lucide-react';
 
-const PinterestTemplateGenerator = () => {
-  const canvasRef = useRef(null);
-  const [uploadedImage, setUploadedImage] = useState(null);
-  const [title, setTitle] = useState("EASY RECIPES FOR HEALTHY EATING TONIGHT");
-  const [subtitle, setSubtitle] = useState("");
-  const [detectedColor, setDetectedColor] = useState("#FF9800");
-  const [useDetectedColor, setUseDetectedColor] = useState(true);
-  const [manualColor, setManualColor] = useState("#FF9800");
-  const [fontSize, setFontSize] = useState(38);
+// Color detection worker. Stringified into a Blob, so it must stay self-contained.
+// Receives { id, bitmap } (bitmap transferred) and answers { id, color }.
+function colorWorkerMain() {
+  // 32x32 = 1024 samples, plenty to rank 512 color bins (keep in sync with COLOR_SAMPLE_SIZE)
+  const SAMPLE_SIZE = 32;
 
-  const detectDominantColor = (imageElement) => {
-    try {
-      // Create a small canvas to analyze colors
-      const canvas = document.createElement('canvas');
-      const ctx = canvas.getContext('2d');
-      canvas.width = 100;
-      canvas.height = 100;
+  // K-means over the opaque, non-white sample pixels (a 32x32 sample is ~1000 pixels)
+  const CLUSTERS = 5;
+  const MAX_ITERATIONS = 10;
+
+  // Banner boost per channel value, built once per worker: x1.3, then x1.4 more for dark colors
+  const BOOST = new Uint8Array(256);
+  const DARK_BOOST = new Uint8Array(256);
+  for (let v = 0; v < 256; v++) {
+    BOOST[v] = Math.min(255, Math.floor(v * 1.3));
+    DARK_BOOST[v] = Math.min(255, Math.floor(v * 1.4));
+  }
+
+  // Pure scan over RGBA bytes: returns the boosted dominant color packed as
+  // 0xRRGGBB, or -1 when nothing vibrant was found. Same contract as a
+  // compiled detect_dominant(ptr, len) -> u32 export, so a wasm build can
+  // replace it without touching the caller.
+  const detectDominant = (pixels) => {
+    // One 32-bit load per pixel (little-endian RGBA: red is the low byte)
+    const p32 = new Uint32Array(pixels.buffer, pixels.byteOffset, pixels.length >> 2);
+    
+    // Candidate pixels as RGB triples, plus a coarse histogram (bin = r<<6 | g<<3 | b,
+    // 8 levels per channel) whose busiest bins seed the clusters
+    const samples = new Float32Array(p32.length * 3);
+    const bins = new Uint32Array(512);
+    const binSums = new Float32Array(512 * 3);
+    let n = 0;
+    
+    for (let i = 0; i < p32.length; i++) {
+      const w = p32[i];
       
-      // Draw scaled-down image
-      ctx.drawImage(imageElement, 0, 0, 100, 100);
-      const imageData = ctx.getImageData(0, 0, 100, 100);
-      const pixels = imageData.data;
+      // Skip transparent or very light pixels (every channel >= 240)
+      if ((w >>> 24) < 128 || (w & 0x00f0f0f0) === 0x00f0f0f0) continue;
       
-      // Color frequency map
-      const colorMap = {};
+      const r = w & 0xff;
+      const g = (w >>> 8) & 0xff;
+      const b = (w >>> 16) & 0xff;
       
-      // Sample every 4th pixel for performance
-      for (let i = 0; i < pixels.length; i += 16) {
-        const r = pixels[i];
-        const g = pixels[i + 1];
-        const b = pixels[i + 2];
-        const a = pixels[i + 3];
-        
-        // Skip transparent or very light pixels
-        if (a < 128 || (r > 240 && g > 240 && b > 240)) continue;
-        
-        // Group similar colors (reduce precision)
-        const rGroup = Math.floor(r / 32) * 32;
-        const gGroup = Math.floor(g / 32) * 32;
-        const bGroup = Math.floor(b / 32) * 32;
-        
-        const colorKey = `${rGroup},${gGroup},${bGroup}`;
-        colorMap[colorKey] = (colorMap[colorKey] || 0) + 1;
+      const bin = ((r >> 5) << 6) | ((g >> 5) << 3) | (b >> 5);
+      bins[bin]++;
+      binSums[bin * 3] += r;
+      binSums[bin * 3 + 1] += g;
+      binSums[bin * 3 + 2] += b;
+      
+      samples[n * 3] = r;
+      samples[n * 3 + 1] = g;
+      samples[n * 3 + 2] = b;
+      n++;
+    }
+    
+    // Seed with the mean colors of the most populated bins (deterministic, no random restarts)
+    const centroids = new Float32Array(CLUSTERS * 3);
+    let k = 0;
+    for (; k < CLUSTERS; k++) {
+      let seed = -1;
+      let seedCount = 0;
+      for (let i = 0; i < 512; i++) {
+        if (bins[i] > seedCount) {
+          seedCount = bins[i];
+          seed = i;
+        }
       }
+      if (seed < 0) break;
       
-      // Find most frequent vibrant color
-      let dominantColor = null;
-      let maxCount = 0;
+      centroids[k * 3] = binSums[seed * 3] / seedCount;
+      centroids[k * 3 + 1] = binSums[seed * 3 + 1] / seedCount;
+      centroids[k * 3 + 2] = binSums[seed * 3 + 2] / seedCount;
+      bins[seed] = 0;
+    }
+    
+    // Lloyd iterations: assign every pixel to its nearest centroid, then move centroids to the means
+    const assignment = new Uint8Array(n);
+    const sums = new Float32Array(k * 3);
+    const weights = new Uint32Array(k);
+    
+    for (let iter = 0; iter < MAX_ITERATIONS; iter++) {
+      let changed = iter === 0;
+      sums.fill(0);
+      weights.fill(0);
       
-      for (const [colorKey, count] of Object.entries(colorMap)) {
-        if (count > maxCount) {
-          const [r, g, b] = colorKey.split(',').map(Number);
-          
-          // Check if color is vibrant enough (not too gray)
-          const max = Math.max(r, g, b);
-          const min = Math.min(r, g, b);
-          const saturation = max === 0 ? 0 : (max - min) / max;
-          
-          // Prefer colors with some saturation and decent brightness
-          if (saturation > 0.2 && max > 80) {
-            maxCount = count;
-            dominantColor = `rgb(${r}, ${g}, ${b})`;
+      for (let i = 0; i < n; i++) {
+        const r = samples[i * 3];
+        const g = samples[i * 3 + 1];
+        const b = samples[i * 3 + 2];
+        
+        let nearest = 0;
+        let nearestDist = Infinity;
+        for (let c = 0; c < k; c++) {
+          const dr = r - centroids[c * 3];
+          const dg = g - centroids[c * 3 + 1];
+          const db = b - centroids[c * 3 + 2];
+          const dist = dr * dr + dg * dg + db * db;
+          if (dist < nearestDist) {
+            nearestDist = dist;
+            nearest = c;
           }
         }
+        
+        if (assignment[i] !== nearest) {
+          assignment[i] = nearest;
+          changed = true;
+        }
+        weights[nearest]++;
+        sums[nearest * 3] += r;
+        sums[nearest * 3 + 1] += g;
+        sums[nearest * 3 + 2] += b;
       }
       
-      // Convert to hex and enhance saturation
-      if (dominantColor) {
-        const rgbMatch = dominantColor.match(/rgb\((\d+), (\d+), (\d+)\)/);
-        if (rgbMatch) {
-          let [, r, g, b] = rgbMatch.map(Number);
-          
-          // Enhance saturation and ensure good contrast
-          const max = Math.max(r, g, b);
-          const factor = 1.3; // Boost saturation
-          
-          r = Math.min(255, Math.floor(r * factor));
-          g = Math.min(255, Math.floor(g * factor));
-          b = Math.min(255, Math.floor(b * factor));
-          
-          // Ensure minimum brightness for banner visibility
-          const brightness = (r * 299 + g * 587 + b * 114) / 1000;
-          if (brightness < 100) {
-            const boost = 1.4;
-            r = Math.min(255, Math.floor(r * boost));
-            g = Math.min(255, Math.floor(g * boost));
-            b = Math.min(255, Math.floor(b * boost));
-          }
-          
-          const hex = `#${r.toString(16).padStart(2, '0')}${g.toString(16).padStart(2, '0')}${b.toString(16).padStart(2, '0')}`;
-          return hex;
-        }
+      for (let c = 0; c < k; c++) {
+        if (weights[c] === 0) continue;
+        centroids[c * 3] = sums[c * 3] / weights[c];
+        centroids[c * 3 + 1] = sums[c * 3 + 1] / weights[c];
+        centroids[c * 3 + 2] = sums[c * 3 + 2] / weights[c];
+      }
+      
+      if (!changed) break;
+    }
+    
+    // Heaviest cluster whose color is vibrant enough: some saturation and decent brightness
+    let best = -1;
+    let maxWeight = 0;
+    
+    for (let c = 0; c < k; c++) {
+      if (weights[c] <= maxWeight) continue;
+      
+      const max = Math.max(centroids[c * 3], centroids[c * 3 + 1], centroids[c * 3 + 2]);
+      const min = Math.min(centroids[c * 3], centroids[c * 3 + 1], centroids[c * 3 + 2]);
+      if (max > 80 && (max - min) / max > 0.2) {
+        maxWeight = weights[c];
+        best = c;
+      }
+    }
+    
+    if (best < 0) return -1;
+    
+    // Enhance saturation and ensure good contrast
+    let r = BOOST[centroids[best * 3] | 0];
+    let g = BOOST[centroids[best * 3 + 1] | 0];
+    let b = BOOST[centroids[best * 3 + 2] | 0];
+    
+    // Ensure minimum brightness for banner visibility
+    if (r * 299 + g * 587 + b * 114 < 100000) {
+      r = DARK_BOOST[r];
+      g = DARK_BOOST[g];
+      b = DARK_BOOST[b];
+    }
+    
+    return (r << 16) | (g << 8) | b;
+  };
+
+  const detectDominantColor = (bitmap) => {
+    try {
+      // Create a small offscreen canvas to analyze colors
+      const canvas = new OffscreenCanvas(SAMPLE_SIZE, SAMPLE_SIZE);
+      const ctx = canvas.getContext('2d', { willReadFrequently: true });
+      
+      // Draw scaled-down image (uploads arrive pre-sized by the decoder)
+      ctx.drawImage(bitmap, 0, 0, SAMPLE_SIZE, SAMPLE_SIZE);
+      const rgb = detectDominant(ctx.getImageData(0, 0, SAMPLE_SIZE, SAMPLE_SIZE).data);
+      
+      if (rgb >= 0) {
+        return `#${rgb.toString(16).padStart(6, '0')}`;
       }
       
       // Fallback to orange
@@ -104,177 +179,258 @@ const PinterestTemplateGenerator = () => {
     }
   };
 
+  self.onmessage = (event) => {
+    const { id, bitmap } = event.data;
+    const color = detectDominantColor(bitmap);
+    bitmap.close();
+    self.postMessage({ id, color });
+  };
+}
+
+// Template layout (Pinterest optimal size)
+const CANVAS_WIDTH = 735;
+const CANVAS_HEIGHT = 1102;
+const TOP_IMAGE_HEIGHT = 400;
+const BANNER_HEIGHT = 120;
+
+// Side of the square thumbnail handed to the color worker
+const COLOR_SAMPLE_SIZE = 32;
+
+const PinterestTemplateGenerator = () => {
+  const canvasRef = useRef(null);
+  const [imageVersion, setImageVersion] = useState(0);
+  const [title, setTitle] = useState("EASY RECIPES FOR HEALTHY EATING TONIGHT");
+  const [subtitle, setSubtitle] = useState("");
+  const [detectedColor, setDetectedColor] = useState("#FF9800");
+  const [useDetectedColor, setUseDetectedColor] = useState(true);
+  const [manualColor, setManualColor] = useState("#FF9800");
+  const [fontSize, setFontSize] = useState(38);
+  const workerRef = useRef(null);
+  const colorRequestRef = useRef(0);
+  const fileRef = useRef(null);
+  const detectedFileRef = useRef(null);
+  const imgRef = useRef(null);
+  const layerRef = useRef(null);
+  const baseRef = useRef(null);
+  const measureCtxRef = useRef(null);
+  const dotPatternRef = useRef(null);
+  const rafRef = useRef(0);
+  const imageDirtyRef = useRef(true);
+
+  // Dominant-color worker, alive for the component's lifetime
+  useEffect(() => {
+    const url = URL.createObjectURL(new Blob([`(${colorWorkerMain.toString()})();`], { type: 'text/javascript' }));
+    const worker = new Worker(url);
+    worker.onmessage = (event) => {
+      // Ignore answers for images that have since been replaced
+      if (event.data.id === colorRequestRef.current) {
+        setDetectedColor(event.data.color);
+      }
+    };
+    workerRef.current = worker;
+    return () => {
+      worker.terminate();
+      URL.revokeObjectURL(url);
+    };
+  }, []);
+
   const handleImageUpload = (event) => {
     const file = event.target.files[0];
     if (file) {
-      const reader = new FileReader();
-      reader.onload = (e) => {
-        setUploadedImage(e.target.result);
-      };
-      reader.readAsDataURL(file);
+      // Decode once, straight from the file; renders draw the bitmap held in imgRef
+      createImageBitmap(file)
+        .then((bitmap) => {
+          // A newer upload may have finished first
+          if (fileRef.current !== file) {
+            bitmap.close();
+            return;
+          }
+          if (imgRef.current) imgRef.current.close();
+          imgRef.current = bitmap;
+          setImageVersion((v) => v + 1);
+        })
+        .catch(() => console.log("Image decode failed"));
+      
+      // The previous image's color no longer applies; only scan if the banner will use it
+      fileRef.current = file;
+      ++colorRequestRef.current;
+      setDetectedColor("#FF9800");
+      if (useDetectedColor) requestColorDetection(file);
     }
   };
 
-  const generatePinterestImage = () => {
+  // Detect color off the main thread; the banner keeps the fallback until the worker answers
+  const requestColorDetection = (file) => {
+    const id = ++colorRequestRef.current;
+    detectedFileRef.current = file;
+    createImageBitmap(file, { resizeWidth: COLOR_SAMPLE_SIZE, resizeHeight: COLOR_SAMPLE_SIZE, resizeQuality: 'low' })
+      .then((bitmap) => workerRef.current.postMessage({ id, bitmap }, [bitmap]))
+      .catch(() => console.log("Color detection failed, using default orange"));
+  };
+
+  // An image uploaded in manual mode is scanned the first time auto color is selected
+  useEffect(() => {
+    if (useDetectedColor && fileRef.current && detectedFileRef.current !== fileRef.current) {
+      requestColorDetection(fileRef.current);
+    }
+  }, [useDetectedColor]);
+
+  // Text wrapping, re-measured only when the title or font size changes
+  const lines = useMemo(() => {
+    if (!measureCtxRef.current) {
+      measureCtxRef.current = new OffscreenCanvas(1, 1).getContext('2d');
+    }
+    const ctx = measureCtxRef.current;
+    ctx.font = `bold ${fontSize}px Arial Black, Impact, Arial`;
+    
+    const words = title.split(' ');
+    const maxWidth = CANVAS_WIDTH - 80;
+    const wrapped = [];
+    let currentLine = '';
+    
+    for (let word of words) {
+      const testLine = currentLine + (currentLine ? ' ' : '') + word;
+      const metrics = ctx.measureText(testLine);
+      
+      if (metrics.width > maxWidth && currentLine) {
+        wrapped.push(currentLine);
+        currentLine = word;
+      } else {
+        currentLine = testLine;
+      }
+    }
+    if (currentLine) wrapped.push(currentLine);
+    return wrapped;
+  }, [title, fontSize]);
+
+  // Shadowed title rendered once per text change; banner repaints just blit it
+  const textLayer = useMemo(() => {
+    const lineHeight = fontSize * 1.1;
+    const pad = 8; // room for the shadow offset and blur
+    const layer = new OffscreenCanvas(CANVAS_WIDTH, Math.ceil(lines.length * lineHeight) + pad * 2);
+    const ctx = layer.getContext('2d');
+    
+    // TEXT STYLING
+    ctx.font = `bold ${fontSize}px Arial Black, Impact, Arial`;
+    ctx.textAlign = 'center';
+    ctx.textBaseline = 'middle';
+    
+    // Draw text lines (dark for the shadow first, then white on top)
+    const drawLines = (target) => {
+      lines.forEach((line, index) => {
+        const y = pad + lineHeight / 2 + (index * lineHeight);
+        target.fillText(line, CANVAS_WIDTH / 2, y);
+      });
+    };
+    
+    // Text shadow for better readability: every line goes onto one sheet that is
+    // blurred in a single filtered copy (blur(2px) matches shadowBlur 4)
+    const shadow = new OffscreenCanvas(layer.width, layer.height);
+    const shadowCtx = shadow.getContext('2d');
+    shadowCtx.font = ctx.font;
+    shadowCtx.textAlign = 'center';
+    shadowCtx.textBaseline = 'middle';
+    shadowCtx.fillStyle = 'rgba(0,0,0,0.4)';
+    drawLines(shadowCtx);
+    
+    ctx.filter = 'blur(2px)';
+    ctx.drawImage(shadow, 2, 2);
+    ctx.filter = 'none';
+    
+    ctx.fillStyle = '#FFFFFF';
+    drawLines(ctx);
+    return layer;
+  }, [lines, fontSize]);
+
+  // Image layers: sections, grid/single indicator, or the placeholder. Rendered into an
+  // offscreen layer (baseRef) that banner/text changes blit back instead of redrawing the photo.
+  const drawImageLayers = () => {
     const canvas = canvasRef.current;
-    const ctx = canvas.getContext('2d');
     
     // Pinterest optimal size
-    canvas.width = 735;
-    canvas.height = 1102;
+    canvas.width = CANVAS_WIDTH;
+    canvas.height = CANVAS_HEIGHT;
     
-    // Clear canvas
-    ctx.clearRect(0, 0, canvas.width, canvas.height);
+    // Kept as a canvas rather than getImageData pixels so restoring it is a GPU-side
+    // drawImage, not a 3 MB readback and upload per repaint
+    if (!layerRef.current) {
+      layerRef.current = new OffscreenCanvas(CANVAS_WIDTH, CANVAS_HEIGHT);
+    }
+    const layer = layerRef.current;
+    const ctx = layer.getContext('2d', { alpha: false });
     
-    if (uploadedImage) {
-      const img = new Image();
-      img.onload = () => {
-        // Detect dominant color
-        const dominantColor = detectDominantColor(img);
-        setDetectedColor(dominantColor);
-        
-        // Template layout dimensions
-        const topImageHeight = 400;
-        const bannerHeight = 120;
-        const bottomImageHeight = canvas.height - topImageHeight - bannerHeight;
-        const bannerY = topImageHeight;
-        const bottomY = topImageHeight + bannerHeight;
-        
-        // Check if image is a grid
-        const aspectRatio = img.width / img.height;
-        const isGrid = aspectRatio > 0.8 && aspectRatio < 1.25;
-        
-        if (isGrid) {
-          // GRID MODE: Extract different quadrants
-          const gridWidth = img.width / 2;
-          const gridHeight = img.height / 2;
-          
-          // Extract top-left quadrant for TOP section
-          const topQuadrant = document.createElement('canvas');
-          topQuadrant.width = gridWidth;
-          topQuadrant.height = gridHeight;
-          const topCtx = topQuadrant.getContext('2d');
-          topCtx.drawImage(img, 0, 0, gridWidth, gridHeight, 0, 0, gridWidth, gridHeight);
-          
-          // Extract bottom-right quadrant for BOTTOM section  
-          const bottomQuadrant = document.createElement('canvas');
-          bottomQuadrant.width = gridWidth;
-          bottomQuadrant.height = gridHeight;
-          const bottomCtx = bottomQuadrant.getContext('2d');
-          bottomCtx.drawImage(img, gridWidth, gridHeight, gridWidth, gridHeight, 0, 0, gridWidth, gridHeight);
-          
-          // Draw TOP section
-          const topScaleWidth = canvas.width;
-          const topScaleHeight = (gridWidth / gridHeight) > (canvas.width / topImageHeight) 
-            ? topImageHeight 
-            : canvas.width * (gridHeight / gridWidth);
-          const topOffsetY = (topImageHeight - topScaleHeight) / 2;
-          
-          ctx.drawImage(topQuadrant, 0, topOffsetY, topScaleWidth, topScaleHeight);
-          
-          // Draw BOTTOM section
-          const bottomScaleWidth = canvas.width;
-          const bottomScaleHeight = (gridWidth / gridHeight) > (canvas.width / bottomImageHeight)
-            ? bottomImageHeight
-            : canvas.width * (gridHeight / gridWidth);
-          const bottomOffsetY = bottomY + (bottomImageHeight - bottomScaleHeight) / 2;
-          
-          ctx.drawImage(bottomQuadrant, 0, bottomOffsetY, bottomScaleWidth, bottomScaleHeight);
-          
-        } else {
-          // SINGLE IMAGE MODE
-          const scaleWidth = canvas.width;
-          const scaleHeight = scaleWidth / aspectRatio;
-          
-          // Draw TOP section
-          const topOffsetY = Math.max(0, (topImageHeight - scaleHeight) / 2);
-          ctx.drawImage(img, 0, topOffsetY, scaleWidth, Math.min(scaleHeight, topImageHeight));
-          
-          // Draw BOTTOM section
-          const bottomOffsetY = bottomY + Math.max(0, (bottomImageHeight - scaleHeight) / 2);
-          ctx.drawImage(img, 0, bottomOffsetY, scaleWidth, Math.min(scaleHeight, bottomImageHeight));
-        }
-        
-        // ADAPTIVE COLOR BANNER
-        const bannerColor = useDetectedColor ? dominantColor : manualColor;
-        ctx.fillStyle = bannerColor;
-        ctx.fillRect(0, bannerY, canvas.width, bannerHeight);
-        
-        // Dotted border decorations
-        ctx.fillStyle = 'rgba(255,255,255,0.9)';
-        const dotSize = 4;
-        const dotSpacing = 12;
-        
-        // Top dotted line
-        for (let x = 20; x < canvas.width - 20; x += dotSpacing) {
-          ctx.fillRect(x, bannerY + 15, dotSize, dotSize);
-        }
-        
-        // Bottom dotted line
-        for (let x = 20; x < canvas.width - 20; x += dotSpacing) {
-          ctx.fillRect(x, bannerY + bannerHeight - 19, dotSize, dotSize);
-        }
-        
-        // TEXT STYLING
-        ctx.fillStyle = '#FFFFFF';
-        ctx.font = `bold ${fontSize}px Arial Black, Impact, Arial`;
-        ctx.textAlign = 'center';
-        ctx.textBaseline = 'middle';
+    // Clear canvas (opaque context: fill rather than clear to transparent black)
+    ctx.fillStyle = '#FFFFFF';
+    ctx.fillRect(0, 0, canvas.width, canvas.height);
+    
+    const img = imgRef.current;
+    if (img) {
+      // Template layout dimensions
+      const topImageHeight = TOP_IMAGE_HEIGHT;
+      const bannerHeight = BANNER_HEIGHT;
+      const bottomImageHeight = canvas.height - topImageHeight - bannerHeight;
+      const bottomY = topImageHeight + bannerHeight;
+      
+      // Check if image is a grid
+      const aspectRatio = img.width / img.height;
+      const isGrid = aspectRatio > 0.8 && aspectRatio < 1.25;
+      
+      if (isGrid) {
+        // GRID MODE: Extract different quadrants
+        const gridWidth = img.width / 2;
+        const gridHeight = img.height / 2;
         
-        // Text shadow for better readability
-        ctx.shadowColor = 'rgba(0,0,0,0.4)';
-        ctx.shadowOffsetX = 2;
-        ctx.shadowOffsetY = 2;
-        ctx.shadowBlur = 4;
+        // Draw TOP section
+        const topScaleWidth = canvas.width;
+        const topScaleHeight = (gridWidth / gridHeight) > (canvas.width / topImageHeight) 
+          ? topImageHeight 
+          : canvas.width * (gridHeight / gridWidth);
+        const topOffsetY = (topImageHeight - topScaleHeight) / 2;
         
-        // Text wrapping
-        const words = title.split(' ');
-        const maxWidth = canvas.width - 80;
-        let lines = [];
-        let currentLine = '';
+        // Top-left quadrant, straight from the source rect
+        ctx.drawImage(img, 0, 0, gridWidth, gridHeight, 0, topOffsetY, topScaleWidth, topScaleHeight);
         
-        for (let word of words) {
-          const testLine = currentLine + (currentLine ? ' ' : '') + word;
-          const metrics = ctx.measureText(testLine);
-          
-          if (metrics.width > maxWidth && currentLine) {
-            lines.push(currentLine);
-            currentLine = word;
-          } else {
-            currentLine = testLine;
-          }
-        }
-        if (currentLine) lines.push(currentLine);
+        // Draw BOTTOM section
+        const bottomScaleWidth = canvas.width;
+        const bottomScaleHeight = (gridWidth / gridHeight) > (canvas.width / bottomImageHeight)
+          ? bottomImageHeight
+          : canvas.width * (gridHeight / gridWidth);
+        const bottomOffsetY = bottomY + (bottomImageHeight - bottomScaleHeight) / 2;
         
-        // Draw text lines
-        const lineHeight = fontSize * 1.1;
-        const totalTextHeight = lines.length * lineHeight;
-        const startY = bannerY + (bannerHeight - totalTextHeight) / 2 + lineHeight / 2;
+        // Bottom-right quadrant, straight from the source rect
+        ctx.drawImage(img, gridWidth, gridHeight, gridWidth, gridHeight, 0, bottomOffsetY, bottomScaleWidth, bottomScaleHeight);
         
-        lines.forEach((line, index) => {
-          const y = startY + (index * lineHeight);
-          ctx.fillText(line, canvas.width / 2, y);
-        });
+      } else {
+        // SINGLE IMAGE MODE
+        const scaleWidth = canvas.width;
+        const scaleHeight = scaleWidth / aspectRatio;
         
-        // Reset shadow
-        ctx.shadowColor = 'transparent';
-        ctx.shadowOffsetX = 0;
-        ctx.shadowOffsetY = 0;
-        ctx.shadowBlur = 0;
+        // Draw TOP section
+        const topOffsetY = Math.max(0, (topImageHeight - scaleHeight) / 2);
+        ctx.drawImage(img, 0, topOffsetY, scaleWidth, Math.min(scaleHeight, topImageHeight));
         
-        // Add color detection indicator
-        if (isGrid) {
-          ctx.fillStyle = 'rgba(0,255,0,0.8)';
-          ctx.font = 'bold 12px Arial';
-          ctx.fillText('✓ Grid Mode + Color Detected', canvas.width / 2, 25);
-        } else {
-          ctx.fillStyle = 'rgba(0,150,255,0.8)';
-          ctx.font = 'bold 12px Arial';
-          ctx.fillText('✓ Single Mode + Color Detected', canvas.width / 2, 25);
-        }
-      };
-      img.src = uploadedImage;
+        // Draw BOTTOM section
+        const bottomOffsetY = bottomY + Math.max(0, (bottomImageHeight - scaleHeight) / 2);
+        ctx.drawImage(img, 0, bottomOffsetY, scaleWidth, Math.min(scaleHeight, bottomImageHeight));
+      }
+      
+      // Add color detection indicator
+      ctx.textAlign = 'center';
+      ctx.textBaseline = 'middle';
+      if (isGrid) {
+        ctx.fillStyle = 'rgba(0,255,0,0.8)';
+        ctx.font = 'bold 12px Arial';
+        ctx.fillText('✓ Grid Mode + Color Detected', canvas.width / 2, 25);
+      } else {
+        ctx.fillStyle = 'rgba(0,150,255,0.8)';
+        ctx.font = 'bold 12px Arial';
+        ctx.fillText('✓ Single Mode + Color Detected', canvas.width / 2, 25);
+      }
+      
+      baseRef.current = layer;
     } else {
+      baseRef.current = null;
+      
       // Placeholder
       ctx.fillStyle = '#f0f0f0';
       ctx.fillRect(0, 0, canvas.width, canvas.height);
@@ -292,19 +448,86 @@ const PinterestTemplateGenerator = () => {
       ctx.fillText('Upload a food image to detect colors automatically', canvas.width / 2, canvas.height / 2 - 100);
       ctx.fillText('Banner color will match your image colors', canvas.width / 2, canvas.height / 2 - 70);
       ctx.fillText('Perfect for food/recipe content!', canvas.width / 2, canvas.height / 2 - 40);
+      
+      canvas.getContext('2d', { alpha: false }).drawImage(layer, 0, 0);
     }
   };
 
+  // Banner, dots and title over the cached image layers
+  const drawBannerLayer = () => {
+    if (!baseRef.current) return;
+    
+    const canvas = canvasRef.current;
+    const ctx = canvas.getContext('2d', { alpha: false });
+    ctx.drawImage(baseRef.current, 0, 0);
+    
+    const bannerY = TOP_IMAGE_HEIGHT;
+    const bannerHeight = BANNER_HEIGHT;
+    
+    // ADAPTIVE COLOR BANNER
+    const bannerColor = useDetectedColor ? detectedColor : manualColor;
+    ctx.fillStyle = bannerColor;
+    ctx.fillRect(0, bannerY, canvas.width, bannerHeight);
+    
+    // Dotted border decorations: one 12x4 dot tile repeated along each row
+    if (!dotPatternRef.current) {
+      const tile = new OffscreenCanvas(12, 4);
+      const tileCtx = tile.getContext('2d');
+      tileCtx.fillStyle = 'rgba(255,255,255,0.9)';
+      tileCtx.fillRect(0, 0, 4, 4);
+      dotPatternRef.current = ctx.createPattern(tile, 'repeat-x');
+    }
+    ctx.fillStyle = dotPatternRef.current;
+    
+    // Patterns are anchored at the origin, so translate to each row's start
+    for (const y of [bannerY + 15, bannerY + bannerHeight - 19]) {
+      ctx.save();
+      ctx.translate(20, y);
+      ctx.fillRect(0, 0, canvas.width - 40, 4);
+      ctx.restore();
+    }
+    
+    // Title, centered on the banner
+    ctx.drawImage(textLayer, 0, Math.round(bannerY + (bannerHeight - textLayer.height) / 2));
+  };
+
+  // At most one paint per frame, however fast the inputs change. The image layers are
+  // only redrawn when a new image marked them dirty; everything else repaints the banner.
+  const scheduleRender = () => {
+    cancelAnimationFrame(rafRef.current);
+    rafRef.current = requestAnimationFrame(() => {
+      if (imageDirtyRef.current) {
+        imageDirtyRef.current = false;
+        drawImageLayers();
+      }
+      drawBannerLayer();
+    });
+  };
+
+  useEffect(() => {
+    imageDirtyRef.current = true;
+    scheduleRender();
+  }, [imageVersion]);
+
   useEffect(() => {
-    generatePinterestImage();
-  }, [uploadedImage, title, subtitle, useDetectedColor, manualColor, fontSize]);
+    scheduleRender();
+  }, [textLayer, subtitle, detectedColor, useDetectedColor, manualColor]);
+
+  useEffect(() => () => cancelAnimationFrame(rafRef.current), []);
 
   const downloadImage = () => {
     const canvas = canvasRef.current;
-    const link = document.createElement('a');
-    link.download = 'pinterest-recipe-template.png';
-    link.href = canvas.toDataURL();
-    link.click();
+    // Encode to a Blob (async, no base64 string) and hand the browser an object URL
+    canvas.toBlob((blob) => {
+      if (!blob) return; // encoding failed
+      const url = URL.createObjectURL(blob);
+      const link = document.createElement('a');
+      link.download = 'pinterest-recipe-template.png';
+      link.href = url;
+      link.click();
+      // Revoking synchronously can cancel the download in Firefox/Safari
+      setTimeout(() => URL.revokeObjectURL(url), 0);
+    }, 'image/png');
   };
 
   const resetToDefaults = () => {